@@ -1,58 +1,116 @@
+import threading
 import time
 import warnings
-from typing import Iterable, List, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, List, Dict, Optional
 
-import akshare as ak
 import pandas as pd
 from requests.exceptions import JSONDecodeError
 
 warnings.filterwarnings('ignore')
 
 RATE_LIMIT_SECONDS = 0.5
+MAX_WORKERS = 16
 OUTPUT_PATH = "chip_industry_results.csv"
 
 
+class _RateLimiter:
+    """简单令牌桶：跨线程限制对 cninfo 接口的总请求速率。"""
+
+    def __init__(self, min_interval: float):
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self._min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+_LIMITER = _RateLimiter(RATE_LIMIT_SECONDS)
+
+
+def _fetch_one(symbol: str) -> Optional[Dict[str, str]]:
+    """查询单个证券的行业变更记录，命中“芯片”时返回结果行。"""
+    import akshare as ak
+
+    _LIMITER.acquire()
+    try:
+        stock_industry_change_cninfo_df = ak.stock_industry_change_cninfo(
+            symbol=symbol,
+            start_date="20091227",
+            end_date="20220708",
+        )
+    except (KeyError, JSONDecodeError, TypeError):
+        # 个别证券缺少 records 字段，或接口返回异常结构，跳过
+        return None
+
+    # 基于底层数组做布尔筛选，省去 .loc 对齐与中间 Series 拷贝
+    mask = stock_industry_change_cninfo_df["分类标准"].to_numpy() == "申银万国行业分类标准"
+    target_series = stock_industry_change_cninfo_df["行业大类"][mask].dropna()
+
+    if target_series.empty:
+        return None
+
+    industry_value = target_series.iloc[0]
+    if isinstance(industry_value, str) and "芯片" in industry_value:
+        return {"代码": symbol, "行业大类": industry_value}
+    return None
+
+
 def fetch_chip_industry_codes(stock_df: pd.DataFrame) -> List[Dict[str, str]]:
-    """遍历证券列表，筛选行业含“芯片”的标的。"""
-    results = []
-    for _, row in stock_df.iterrows():
-        # 证券代码 or A股代码
-        symbol = row["证券代码"] if "证券代码" in row else row["A股代码"]
-        try:
-            stock_industry_change_cninfo_df = ak.stock_industry_change_cninfo(
-                symbol=symbol,
-                start_date="20091227",
-                end_date="20220708",
-            )
-        except (KeyError, JSONDecodeError, TypeError):
-            # 个别证券缺少 records 字段，或接口返回异常结构，跳过
-            continue
-
-        # 控制请求节奏，避免频繁访问
-        time.sleep(RATE_LIMIT_SECONDS)
-
-        target_series = stock_industry_change_cninfo_df.loc[
-            stock_industry_change_cninfo_df["分类标准"] == "申银万国行业分类标准",
-            "行业大类",
-        ].dropna()
-
-        if target_series.empty:
-            continue
-
-        industry_value = target_series.iloc[0]
-        if isinstance(industry_value, str) and "芯片" in industry_value:
-            results.append({"代码": symbol, "行业大类": industry_value})
+    """并发遍历证券列表，筛选行业含“芯片”的标的。"""
+    symbols = [
+        row["证券代码"] if "证券代码" in row else row["A股代码"]
+        for _, row in stock_df.iterrows()
+    ]
+
+    results: List[Dict[str, str]] = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(_fetch_one, symbol) for symbol in symbols]
+        for future in as_completed(futures):
+            record = future.result()
+            if record is not None:
+                results.append(record)
 
     return results
 
 
+def _prefilter_chip_symbols() -> Optional[set]:
+    """用“芯片”概念板块一次性圈定候选证券，避免对全部 A 股逐只查询。"""
+    import akshare as ak
+
+    try:
+        cons_df = ak.stock_board_concept_cons_em(symbol="芯片")
+        return set(cons_df["代码"].astype(str).str.zfill(6))
+    except Exception:
+        # 板块接口失败时退回全量扫描
+        return None
+
+
 def main():
+    # akshare 导入较重，推迟到真正执行抓取的入口
+    import akshare as ak
+
     # 上证、深证列表
     stock_info_sh_name_code_df = ak.stock_info_sh_name_code(symbol="主板A股")
     stock_info_sz_name_code_df = ak.stock_info_sz_name_code(symbol="A股列表")
 
+    candidates = _prefilter_chip_symbols()
+    if candidates is not None:
+        print(f"已通过概念板块预筛出 {len(candidates)} 个候选证券。")
+
     all_results: List[Dict[str, str]] = []
     for stock_df in (stock_info_sh_name_code_df, stock_info_sz_name_code_df):
+        if candidates is not None:
+            symbol_col = "证券代码" if "证券代码" in stock_df.columns else "A股代码"
+            stock_df = stock_df[
+                stock_df[symbol_col].astype(str).str.zfill(6).isin(candidates)
+            ]
         all_results.extend(fetch_chip_industry_codes(stock_df))
 
     result_df = pd.DataFrame(all_results).drop_duplicates()
@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
+import random
 import time
+from datetime import date
+from functools import lru_cache, partial
 from io import StringIO
 from pathlib import Path
 from typing import Iterable, List, Sequence
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
-import akshare as ak
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - 可选加速依赖
+    aiohttp = None
 
 CONCEPT_NAME_CANDIDATES: Sequence[str] = ("概念名称", "板块名称", "名称")
 CONCEPT_CODE_CANDIDATES: Sequence[str] = ("概念代码", "板块代码", "代码")
 STOCK_CODE_CANDIDATES: Sequence[str] = ("股票代码", "证券代码", "代码")
 STOCK_NAME_CANDIDATES: Sequence[str] = ("股票简称", "股票名称", "名称", "证券简称")
+_STOCK_CODE_SET = frozenset(STOCK_CODE_CANDIDATES)
+_STOCK_NAME_SET = frozenset(STOCK_NAME_CANDIDATES)
 
 THS_DETAIL_URL = "http://q.10jqka.com.cn/gn/detail/code/{code}/"
 THS_HEADERS = {
@@ -25,18 +37,62 @@ THS_HEADERS = {
     "Referer": "http://q.10jqka.com.cn/gn/",
 }
 THS_TIMEOUT = 15
+THS_CONCURRENCY = 20
+
+# 复用带连接池的 Session，避免每次请求重建 TCP/TLS 连接；重试由自身循环负责
+_SESSION = requests.Session()
+_SESSION.mount(
+    "http://",
+    HTTPAdapter(pool_connections=THS_CONCURRENCY, pool_maxsize=THS_CONCURRENCY, max_retries=0),
+)
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=THS_CONCURRENCY, pool_maxsize=THS_CONCURRENCY, max_retries=0),
+)
+
+
+# 概念列表变化缓慢，按日缓存到本地 parquet，避免开发期反复全量拉取
+_CONCEPT_CACHE_DIR = Path("~/.cache/concept_meta").expanduser()
+# 单个概念成份表同样按 (概念代码, 日期) 缓存，部分失败后重跑只补缺口
+_CONSTITUENT_CACHE_DIR = _CONCEPT_CACHE_DIR / "constituents"
+
+_MAX_BACKOFF_SECONDS = 30.0
+# SystemRandom 让并发 worker 的抖动互不相关
+_RANDOM = random.SystemRandom()
+
+
+def _backoff_delay(attempt: int, pause: float) -> float:
+    """指数退避 + 随机抖动，避免多路并发重试同时打到上游。"""
+    return min(
+        _MAX_BACKOFF_SECONDS,
+        pause * (2 ** (attempt - 1)) * (1 + _RANDOM.uniform(0, 0.5)),
+    )
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """除 429 外的 4xx 属于确定性失败，重试没有意义。"""
+    status: int | None = None
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+    elif aiohttp is not None and isinstance(exc, aiohttp.ClientResponseError):
+        status = exc.status
+    if status is not None and 400 <= status < 500 and status != 429:
+        return False
+    return True
 
 
 def _normalize_columns(columns: Iterable[object]) -> List[str]:
-    return [str(col).strip() for col in columns]
+    return list(map(str.strip, map(str, columns)))
 
 
+# 同花顺各概念页的表头几乎完全一致，按 (列名元组, 候选) 记忆化即可命中
+@lru_cache(maxsize=64)
 def _locate_column(
-    columns: Sequence[str],
-    candidates: Sequence[str],
+    columns: tuple[str, ...],
+    candidates: tuple[str, ...],
     *,
     fallback_contains: str | None = None,
-    exclude_contains: Sequence[str] = (),
+    exclude_contains: tuple[str, ...] = (),
     label: str = "",
 ) -> str:
     for candidate in candidates:
@@ -55,8 +111,23 @@ def _locate_column(
     raise ValueError(f"无法在列 {columns} 中找到“{label or fallback_contains or candidates}”")
 
 
-def _fetch_concept_metadata(retries: int, pause: float) -> tuple[pd.DataFrame, str, str]:
+def _fetch_concept_metadata(
+    retries: int, pause: float, *, use_cache: bool = True
+) -> tuple[pd.DataFrame, str, str]:
     """Download THS concept table and detect key columns."""
+    cache_file = _CONCEPT_CACHE_DIR / f"ths_{date.today():%Y%m%d}.parquet"
+    if use_cache and cache_file.exists():
+        try:
+            df = pd.read_parquet(cache_file)
+        except Exception as exc:
+            print(f"[WARN] 读取概念列表缓存失败，改为重新拉取: {exc}")
+        else:
+            print(f"[INFO] 使用当日概念列表缓存（{len(df)} 个，{cache_file}）。")
+            return df, "概念名称", "概念代码"
+
+    # akshare 导入开销超过 1 秒，推迟到真正需要拉取时
+    import akshare as ak
+
     last_error: Exception | None = None
     df: pd.DataFrame | None = None
     for attempt in range(1, retries + 1):
@@ -65,7 +136,7 @@ def _fetch_concept_metadata(retries: int, pause: float) -> tuple[pd.DataFrame, s
             break
         except Exception as exc:
             last_error = exc
-            sleep_time = pause * attempt
+            sleep_time = _backoff_delay(attempt, pause)
             print(
                 f"[WARN] 获取同花顺概念列表失败({attempt}/{retries}): {exc}. "
                 f"{sleep_time:.1f}s 后重试。"
@@ -81,9 +152,96 @@ def _fetch_concept_metadata(retries: int, pause: float) -> tuple[pd.DataFrame, s
     df["概念名称"] = df["概念名称"].astype(str).str.strip()
     df["概念代码"] = df["概念代码"].astype(str).str.strip()
     print(f"[INFO] 已获取同花顺概念 {len(df)} 个。")
+
+    if use_cache:
+        try:
+            _CONCEPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_file)
+        except Exception as exc:  # pragma: no cover - 缓存失败不影响主流程
+            print(f"[WARN] 写入概念列表缓存失败: {exc}")
+
     return df, "概念名称", "概念代码"
 
 
+def _install_shared_session() -> None:
+    """把 requests.get/post 重定向到模块级连接池。
+
+    akshare 内部直接调用 requests.get，每次请求都会临时建 Session 并付出
+    一次 TCP/TLS 握手；重定向后同主机调用可复用 keep-alive 连接。
+    """
+    if getattr(requests, "_dataflow_pooled", False):
+        return
+    requests.get = partial(_SESSION.request, "get")
+    requests.post = partial(_SESSION.request, "post")
+    requests._dataflow_pooled = True
+
+
+def _constituent_cache_path(concept_code: str) -> Path:
+    key = hashlib.blake2b(
+        f"{concept_code}|{date.today():%Y%m%d}".encode(), digest_size=8
+    ).hexdigest()
+    return _CONSTITUENT_CACHE_DIR / f"{key}.parquet"
+
+
+def _load_cached_constituents(concept_code: str) -> pd.DataFrame | None:
+    """返回当日缓存的成份表；空结果以 .empty 标记文件表示。"""
+    path = _constituent_cache_path(concept_code)
+    if path.with_suffix(".empty").exists():
+        return pd.DataFrame()
+    if not path.exists():
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as exc:
+        print(f"[WARN] 读取概念 {concept_code} 成份缓存失败，将重新拉取: {exc}")
+        return None
+
+
+def _store_cached_constituents(concept_code: str, df: pd.DataFrame | None) -> None:
+    if df is None:
+        # 拉取失败不落盘，让重跑时有机会重试
+        return
+    path = _constituent_cache_path(concept_code)
+    try:
+        _CONSTITUENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if df.empty:
+            path.with_suffix(".empty").touch()
+        else:
+            df.to_parquet(path)
+    except Exception as exc:  # pragma: no cover - 缓存失败不影响主流程
+        print(f"[WARN] 写入概念 {concept_code} 成份缓存失败: {exc}")
+
+
+def _parse_concept_tables(html: str) -> pd.DataFrame:
+    """Parse the THS detail page and return the constituent table."""
+    try:
+        # lxml 解析远快于默认的 bs4/html5lib；match 先按正则筛掉无关表格
+        tables = pd.read_html(StringIO(html), flavor="lxml", match="代码")
+    except (ImportError, ValueError):
+        tables = pd.read_html(StringIO(html))
+    if not tables:
+        raise ValueError("未解析到成份表")
+
+    selected: pd.DataFrame | None = None
+    for table in tables:
+        normalized_cols = _normalize_columns(table.columns)
+        col_set = frozenset(normalized_cols)
+        has_code = not _STOCK_CODE_SET.isdisjoint(col_set)
+        has_name = not _STOCK_NAME_SET.isdisjoint(col_set)
+        if has_code and has_name:
+            selected = table.copy()
+            selected.columns = normalized_cols
+            break
+
+    if selected is None:
+        raise ValueError("未找到包含代码/名称列的成份表")
+
+    if "代码" in selected.columns:
+        # C 层字符操作，比 pandas 字符串访问器的逐元素循环快数倍
+        selected["代码"] = np.char.zfill(selected["代码"].to_numpy(dtype=str), 6)
+    return selected
+
+
 def _fetch_single_concept(
     identifiers: Sequence[str],
     *,
@@ -100,31 +258,14 @@ def _fetch_single_concept(
     last_error: Exception | None = None
     for attempt in range(1, retries + 1):
         try:
-            resp = requests.get(url, headers=THS_HEADERS, timeout=THS_TIMEOUT)
+            resp = _SESSION.get(url, headers=THS_HEADERS, timeout=THS_TIMEOUT)
             resp.raise_for_status()
-            tables = pd.read_html(StringIO(resp.text))
-            if not tables:
-                raise ValueError("未解析到成份表")
-
-            selected: pd.DataFrame | None = None
-            for table in tables:
-                normalized_cols = _normalize_columns(table.columns)
-                has_code = any(col in normalized_cols for col in STOCK_CODE_CANDIDATES)
-                has_name = any(col in normalized_cols for col in STOCK_NAME_CANDIDATES)
-                if has_code and has_name:
-                    selected = table.copy()
-                    selected.columns = normalized_cols
-                    break
-
-            if selected is None:
-                raise ValueError("未找到包含代码/名称列的成份表")
-
-            if "代码" in selected.columns:
-                selected["代码"] = selected["代码"].astype(str).str.zfill(6)
-            return selected
+            return _parse_concept_tables(resp.text)
         except Exception as exc:
             last_error = exc
-            sleep_time = pause * attempt
+            if not _is_retryable(exc):
+                break
+            sleep_time = _backoff_delay(attempt, pause)
             print(
                 f"[WARN] 拉取同花顺概念 {concept_name}({concept_code}) "
                 f"失败({attempt}/{retries}): {exc}. {sleep_time:.1f}s 后重试。"
@@ -137,22 +278,91 @@ def _fetch_single_concept(
     return None
 
 
+async def _fetch_single_concept_async(
+    session: "aiohttp.ClientSession",
+    semaphore: asyncio.Semaphore,
+    identifiers: Sequence[str],
+    *,
+    retries: int,
+    pause: float,
+) -> pd.DataFrame | None:
+    concept_name = identifiers[0] if identifiers else ""
+    concept_code = identifiers[1] if len(identifiers) > 1 else ""
+    if not concept_code:
+        print(f"[WARN] 同花顺概念 {concept_name} 缺少代码，已跳过。")
+        return None
+
+    url = THS_DETAIL_URL.format(code=concept_code)
+    loop = asyncio.get_running_loop()
+    last_error: Exception | None = None
+    for attempt in range(1, retries + 1):
+        try:
+            async with semaphore:
+                async with session.get(
+                    url,
+                    headers=THS_HEADERS,
+                    timeout=aiohttp.ClientTimeout(total=THS_TIMEOUT),
+                ) as resp:
+                    resp.raise_for_status()
+                    html = await resp.text()
+            # 解析 HTML 属于 CPU 密集操作，放到线程池避免阻塞事件循环
+            return await loop.run_in_executor(None, _parse_concept_tables, html)
+        except Exception as exc:
+            last_error = exc
+            if not _is_retryable(exc):
+                break
+            sleep_time = _backoff_delay(attempt, pause)
+            print(
+                f"[WARN] 拉取同花顺概念 {concept_name}({concept_code}) "
+                f"失败({attempt}/{retries}): {exc}. {sleep_time:.1f}s 后重试。"
+            )
+            await asyncio.sleep(sleep_time)
+    if last_error:
+        print(
+            f"[ERROR] 同花顺概念 {concept_name}({concept_code}) 获取失败: {last_error}"
+        )
+    return None
+
+
+async def _fetch_all_concepts(
+    identifiers_list: Sequence[Sequence[str]],
+    *,
+    retries: int,
+    pause: float,
+    concurrency: int = THS_CONCURRENCY,
+) -> list[pd.DataFrame | None]:
+    """并发抓取全部概念成份表，结果顺序与输入一致。"""
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [
+            _fetch_single_concept_async(
+                session, semaphore, identifiers, retries=retries, pause=pause
+            )
+            for identifiers in identifiers_list
+        ]
+        return list(await asyncio.gather(*tasks))
+
+
 def _standardize_constituents(df: pd.DataFrame) -> pd.DataFrame:
     """Ensure constituent dataframe has 股票代码/股票简称列。"""
     if df.empty:
         return df
 
-    columns = list(df.columns)
+    columns = tuple(df.columns)
+    if "股票代码" in columns and "股票简称" in columns:
+        return df
+
     code_col = _locate_column(
         columns,
-        STOCK_CODE_CANDIDATES,
+        tuple(STOCK_CODE_CANDIDATES),
         fallback_contains="代码",
         exclude_contains=("板块", "概念"),
         label="股票代码",
     )
     name_col = _locate_column(
         columns,
-        STOCK_NAME_CANDIDATES,
+        tuple(STOCK_NAME_CANDIDATES),
         fallback_contains="名",
         exclude_contains=("板块", "概念"),
         label="股票名称",
@@ -167,16 +377,36 @@ def _standardize_constituents(df: pd.DataFrame) -> pd.DataFrame:
     return df.rename(columns=rename_map)
 
 
+def _write_output(df: pd.DataFrame, output: Path) -> None:
+    """按后缀写出结果：parquet 优先，xlsx 走 xlsxwriter 流式模式。"""
+    if output.suffix.lower() == ".parquet":
+        df.to_parquet(output, compression="zstd", index=False)
+        return
+    try:
+        writer = pd.ExcelWriter(
+            output,
+            engine="xlsxwriter",
+            engine_kwargs={"options": {"constant_memory": True}},
+        )
+    except (ImportError, ValueError):  # 未安装 xlsxwriter 时退回默认引擎
+        writer = pd.ExcelWriter(output)
+    with writer:
+        df.to_excel(writer, index=False)
+
+
 def export_eastmoney_concepts(
     output_path: str | Path,
     *,
     limit: int | None = None,
     retries: int = 3,
     pause: float = 1.0,
+    use_cache: bool = True,
+    refresh: bool = False,
 ) -> tuple[Path, list[str]]:
     """Download THS concept constituents and export to Excel."""
+    _install_shared_session()
     concept_df, name_col, code_col = _fetch_concept_metadata(
-        retries=retries, pause=pause
+        retries=retries, pause=pause, use_cache=use_cache
     )
     concept_df = concept_df.dropna(subset=[name_col]).drop_duplicates(subset=[name_col])
 
@@ -184,36 +414,84 @@ def export_eastmoney_concepts(
     failures: list[str] = []
     print("[INFO] 当前数据源: 同花顺")
 
-    iterable = concept_df[[name_col, code_col]].itertuples(index=False, name=None)
-    for idx, row in enumerate(iterable, start=1):
-        if limit is not None and idx > limit:
-            break
-        concept_name = str(row[0]).strip()
-        raw_code = row[1] if len(row) > 1 else ""
-        concept_code = "" if raw_code is None else str(raw_code).strip()
-
-        if not concept_name:
-            continue
-
-        identifiers = (concept_name, concept_code)
-        cons_df = _fetch_single_concept(identifiers, retries=retries, pause=pause)
+    # 一次性向量化完成 str/strip 规整，循环内只剩纯 Python 派发
+    concept_names = concept_df[name_col].astype(str).str.strip().to_numpy()
+    concept_codes = (
+        concept_df[code_col].fillna("").astype(str).str.strip().to_numpy()
+    )
+    if limit is not None:
+        concept_names = concept_names[:limit]
+        concept_codes = concept_codes[:limit]
+
+    identifiers_list: list[tuple[str, str]] = [
+        (name, code) for name, code in zip(concept_names, concept_codes) if name
+    ]
+
+    results: list[pd.DataFrame | None] = [None] * len(identifiers_list)
+    pending_idx: list[int] = []
+    for i, (_, concept_code) in enumerate(identifiers_list):
+        cached = (
+            _load_cached_constituents(concept_code)
+            if use_cache and not refresh and concept_code
+            else None
+        )
+        if cached is None:
+            pending_idx.append(i)
+        else:
+            results[i] = cached
+    cache_hits = len(identifiers_list) - len(pending_idx)
+    if cache_hits:
+        print(f"[INFO] 命中 {cache_hits} 个概念的当日成份缓存。")
+
+    pending_ids = [identifiers_list[i] for i in pending_idx]
+    if aiohttp is not None:
+        fetched = asyncio.run(
+            _fetch_all_concepts(pending_ids, retries=retries, pause=pause)
+        )
+    else:
+        # 未安装 aiohttp 时退回逐个抓取
+        fetched = [
+            _fetch_single_concept(identifiers, retries=retries, pause=pause)
+            for identifiers in pending_ids
+        ]
+    for i, cons_df in zip(pending_idx, fetched):
+        results[i] = cons_df
+        if use_cache:
+            _store_cached_constituents(identifiers_list[i][1], cons_df)
+
+    names: list[str] = []
+    codes: list[str] = []
+    for idx, (identifiers, cons_df) in enumerate(
+        zip(identifiers_list, results), start=1
+    ):
+        concept_name, concept_code = identifiers
         if cons_df is None or cons_df.empty:
             failures.append(concept_name)
             continue
 
         cons_df = _standardize_constituents(cons_df)
-        cons_df.insert(0, "概念名称", concept_name)
-        cons_df.insert(1, "概念代码", concept_code)
+        # 概念名称/代码延后到最终合并时一次性补齐，避免逐帧插列复制
+        cons_df["__k"] = len(names)
+        names.append(concept_name)
+        codes.append(concept_code)
         frames.append(cons_df)
         print(f"[{idx}] {concept_name} -> {len(cons_df)} 条成份股。")
 
     if not frames:
         raise RuntimeError("未能成功获取任何概念成份股，请稍后重试。")
 
+    key_df = pd.DataFrame(
+        {"__k": range(len(frames)), "概念名称": names, "概念代码": codes}
+    )
     combined = pd.concat(frames, ignore_index=True)
+    combined = combined.merge(key_df, on="__k", how="left", validate="m:1").drop(
+        columns="__k"
+    )
+    leading = ["概念名称", "概念代码"]
+    combined = combined[leading + [c for c in combined.columns if c not in leading]]
     output = Path(output_path).expanduser().resolve()
     output.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_excel(output, index=False)
+    _write_output(combined, output)
 
     print(f"已导出 {len(combined)} 条股票-概念映射到 {output}")
     if failures:
@@ -228,11 +506,21 @@ def _parse_args() -> argparse.Namespace:
         "-o",
         "--output",
         default="eastmoney_concept_constituents.xlsx",
-        help="输出 Excel 路径（默认: eastmoney_concept_constituents.xlsx）",
+        help="输出路径，支持 .xlsx 或 .parquet（默认: eastmoney_concept_constituents.xlsx）",
     )
     parser.add_argument("--limit", type=int, default=None, help="仅抓取前 N 个概念，调试用。")
     parser.add_argument("--retries", type=int, default=3, help="单个概念请求重试次数。")
     parser.add_argument("--pause", type=float, default=1.0, help="重试间隔的基准秒数。")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="跳过当日概念列表缓存，强制重新拉取。",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="忽略已缓存的成份表并重新下载（仍会写回缓存）。",
+    )
     return parser.parse_args()
 
 
@@ -243,6 +531,8 @@ def main() -> None:
         limit=args.limit,
         retries=args.retries,
         pause=args.pause,
+        use_cache=not args.no_cache,
+        refresh=args.refresh,
     )
 
 
@@ -6,8 +6,6 @@ from typing import Iterable, List, Tuple
 
 import pandas as pd
 
-import akshare as ak
-
 
 REQUIRED_INFO_COLUMNS = {"行业代码", "行业名称"}
 
@@ -21,18 +19,40 @@ def _validate_info_columns(columns: Iterable[str]) -> None:
         )
 
 
+def _write_output(df: pd.DataFrame, output: Path) -> None:
+    """根据输出后缀选择 parquet 或流式 xlsx 写出。"""
+    if output.suffix.lower() == ".parquet":
+        df.to_parquet(output, compression="zstd", index=False)
+        return
+    try:
+        writer = pd.ExcelWriter(
+            output,
+            engine="xlsxwriter",
+            engine_kwargs={"options": {"constant_memory": True}},
+        )
+    except (ImportError, ValueError):
+        writer = pd.ExcelWriter(output)
+    with writer:
+        df.to_excel(writer, index=False)
+
+
 def fetch_all_sw_third_constituents(
     output_path: str | Path, *, limit: int | None = None
 ) -> Tuple[Path, List[str]]:
     """
     返回所有申万三级行业成份股，并保存到 Excel 文件中。
     """
+    # 延迟导入：akshare 体量大，仅在抓取时才需要
+    import akshare as ak
 
     info_df = ak.sw_index_third_info()
     _validate_info_columns(info_df.columns)
 
     frames: List[pd.DataFrame] = []
     failures: List[str] = []
+    codes: List[str] = []
+    names: List[str] = []
+    parents: List[str] = []
 
     for idx, (_, row) in enumerate(info_df.iterrows(), start=1):
         if limit is not None and idx > limit:
@@ -52,11 +72,11 @@ def fetch_all_sw_third_constituents(
             print(f"[INFO] {code}-{name} 未返回成份数据，已跳过。")
             continue
 
-        cons_df = cons_df.copy()
-        cons_df.insert(0, "所属三级行业名称", name)
-        cons_df.insert(0, "所属三级行业代码", code)
-        if parent:
-            cons_df.insert(0, "所属二级行业", parent)
+        # 行业信息延后到最终合并时一次性补齐，避免逐帧插列复制
+        cons_df["__k"] = len(codes)
+        codes.append(code)
+        names.append(name)
+        parents.append(parent or "")
 
         frames.append(cons_df)
         print(f"[OK] 已获取 {code}-{name} 成份股 {len(cons_df)} 条。")
@@ -64,10 +84,25 @@ def fetch_all_sw_third_constituents(
     if not frames:
         raise RuntimeError("未能获取任何成份股数据，请稍后重试。")
 
+    key_df = pd.DataFrame(
+        {
+            "__k": range(len(frames)),
+            "所属二级行业": parents,
+            "所属三级行业代码": codes,
+            "所属三级行业名称": names,
+        }
+    )
     combined_df = pd.concat(frames, ignore_index=True)
+    combined_df = combined_df.merge(
+        key_df, on="__k", how="left", validate="m:1"
+    ).drop(columns="__k")
+    leading = ["所属二级行业", "所属三级行业代码", "所属三级行业名称"]
+    combined_df = combined_df[
+        leading + [c for c in combined_df.columns if c not in leading]
+    ]
     output = Path(output_path).expanduser().resolve()
     output.parent.mkdir(parents=True, exist_ok=True)
-    combined_df.to_excel(output, index=False)
+    _write_output(combined_df, output)
 
     print(f"已导出 {len(combined_df)} 条记录至 {output}")
     if failures:
@@ -1,11 +1,67 @@
 # mypy: disable - error - code = "no-untyped-def,misc"
+import mimetypes
 import pathlib
+import starlette
 from fastapi import FastAPI, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.middleware.gzip import GZipMiddleware
 
 # 定义 FastAPI 应用
 app = FastAPI()
 
+# 动态响应按需 gzip；小于 1KB 的响应不值得压缩
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+def _gzip_skips_encoded_responses() -> bool:
+    """starlette >= 0.39 的 GZipMiddleware 会跳过已带 Content-Encoding 的响应。
+
+    旧版本会把预压缩的 .br/.gz 响应体再 gzip 一次导致损坏，
+    此时退回普通静态文件服务。
+    """
+    try:
+        major, minor = starlette.__version__.split(".")[:2]
+        return (int(major), int(minor)) >= (0, 39)
+    except (AttributeError, ValueError):
+        return False
+
+
+_SERVE_PRECOMPRESSED = _gzip_skips_encoded_responses()
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """优先返回构建期预压缩的 .br/.gz 静态资源，省去在线压缩开销。"""
+
+    async def get_response(self, path: str, scope):
+        if not _SERVE_PRECOMPRESSED:
+            return await super().get_response(path, scope)
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        for suffix, encoding in ((".br", "br"), (".gz", "gzip")):
+            if encoding not in accept_encoding:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except StarletteHTTPException:
+                # StaticFiles 抛的是 starlette 的 404，预压缩副本不存在时走下一候选
+                continue
+            if response.status_code != 200:
+                continue
+            media_type, _ = mimetypes.guess_type(path)
+            if media_type:
+                response.headers["content-type"] = media_type
+            response.headers["content-encoding"] = encoding
+            response.headers["vary"] = "Accept-Encoding"
+            return response
+
+        return await super().get_response(path, scope)
+
 
 def create_frontend_router(build_dir="../frontend/dist"):
     """创建用于服务 React 前端的路由器。
@@ -22,19 +78,21 @@ def create_frontend_router(build_dir="../frontend/dist"):
         print(
             f"WARN: Frontend build directory not found or incomplete at {build_path}. Serving frontend will likely fail."
         )
-        # 当前端尚未构建时返回占位路由
+        # 当前端尚未构建时返回占位路由；响应体不变，构造一次反复复用
         from starlette.routing import Route
 
+        placeholder = Response(
+            "前端尚未构建，请在 frontend 目录运行 'npm run build'。",
+            media_type="text/plain",
+            status_code=503,
+        )
+
         async def dummy_frontend(request):
-            return Response(
-                "前端尚未构建，请在 frontend 目录运行 'npm run build'。",
-                media_type="text/plain",
-                status_code=503,
-            )
+            return placeholder
 
         return Route("/{path:path}", endpoint=dummy_frontend)
 
-    return StaticFiles(directory=build_path, html=True)
+    return PrecompressedStaticFiles(directory=build_path, html=True)
 
 
 # 将前端挂载在 /app，避免与 LangGraph API 路由冲突
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pydantic import BaseModel, Field
 from typing import Any, Optional
 
@@ -48,6 +49,12 @@ class Configuration(BaseModel):
             config["configurable"] if config and "configurable" in config else {}
         )
 
+        # 同一次图调用中各节点拿到的是同一份 configurable，
+        # 首次解析后把实例挂回去，后续节点连环境变量都不用再读
+        cached = configurable.get("_cached_conf")
+        if isinstance(cached, cls):
+            return cached
+
         # 优先从环境变量或传入配置中获取原始值
         raw_values: dict[str, Any] = {
             name: os.environ.get(name.upper(), configurable.get(name))
@@ -57,4 +64,25 @@ class Configuration(BaseModel):
         # 过滤掉值为 None 的键
         values = {k: v for k, v in raw_values.items() if v is not None}
 
-        return cls(**values)
+        try:
+            instance = cls._build(tuple(sorted(values.items())))
+        except TypeError:
+            # 配置值不可哈希时放弃缓存，直接构造
+            instance = cls(**values)
+
+        try:
+            configurable["_cached_conf"] = instance
+        except TypeError:  # configurable 可能是不可变映射
+            pass
+        return instance
+
+    @classmethod
+    @lru_cache(maxsize=16)
+    def _build(cls, values_tuple: tuple) -> "Configuration":
+        """按配置项元组缓存实例，图中各节点重复解析同一配置时免去校验开销。"""
+        return cls(**dict(values_tuple))
+
+    @classmethod
+    def reset_cache(cls) -> None:
+        """清空实例缓存（例如环境变量变更后）。"""
+        cls._build.cache_clear()
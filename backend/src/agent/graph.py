@@ -1,4 +1,11 @@
+import asyncio
+import hashlib
+import json
 import os
+import weakref
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
 from typing import List
 
 import dotenv
@@ -6,7 +13,7 @@ from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Send
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient
 
 from agent.configuration import Configuration
 from agent.prompts import (
@@ -26,7 +33,6 @@ from agent.tools_and_schemas import Reflection, SearchQueryList
 from agent.utils import (
     get_research_topic,
     replace_citation_tokens,
-    resolve_urls,
 )
 from langchain_community.chat_models import ChatTongyi
 
@@ -38,7 +44,123 @@ if os.getenv("DASHSCOPE_API_KEY") is None:
 if os.getenv("TAVILY_API_KEY") is None:
     raise ValueError("TAVILY_API_KEY is not set")
 
-tavily_client = TavilyClient(api_key=os.environ["TAVILY_API_KEY"])
+tavily_client = AsyncTavilyClient(api_key=os.environ["TAVILY_API_KEY"])
+
+# 限制并行调研分支的并发度，避免无界 fan-out 拖高尾延迟
+_RESEARCH_CONCURRENCY = 5
+
+# asyncio.Semaphore 会绑定首次使用它的事件循环，模块级单例在同一进程里
+# 第二次 asyncio.run 时会报 "bound to a different event loop"，
+# 因此按当前运行中的循环惰性创建；弱引用键让已关闭的循环自动释放
+_research_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _research_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _research_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_RESEARCH_CONCURRENCY)
+        _research_semaphores[loop] = semaphore
+    return semaphore
+
+# 摘要之间的分隔符；每段摘要写入状态时自带尾部分隔符
+_SUMMARY_SEPARATOR = "\n\n---\n\n"
+
+# Tavily 自带综述达到该长度即视为足够充分，可跳过总结 LLM
+_TAVILY_ANSWER_MIN_CHARS = 200
+
+
+def _joined_summaries(state: OverallState) -> str:
+    """读取增量拼接的摘要串，去掉末尾多余的分隔符。"""
+    joined = state.get("summaries_joined")
+    if joined:
+        return joined.removesuffix(_SUMMARY_SEPARATOR)
+    return _SUMMARY_SEPARATOR.join(state["web_research_result"])
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model: str, temperature: float) -> ChatTongyi:
+    """按 (模型, 温度) 复用 ChatTongyi 实例及其底层连接池。"""
+    return ChatTongyi(
+        model=model,
+        temperature=temperature,
+        max_retries=2,
+        api_key=os.getenv("DASHSCOPE_API_KEY"),
+    )
+
+# 调研结果缓存：反思环节经常重发相同查询，命中时跳过 Tavily 与总结 LLM。
+# 以规整后的查询字符串精确匹配（仓库内暂无嵌入服务，无法做语义相似度召回），
+# 写穿到 jsonl 以便跨进程复用。与 dataflow 侧的缓存一致按天失效，
+# 保证提示词里"获取最新信息"的承诺不被隔日的陈旧结果打破。
+_WEB_CACHE_PATH = Path("~/.cache/langgraph_cus/web_research_cache.jsonl").expanduser()
+_web_cache: dict | None = None
+
+
+def _web_cache_key(query: str) -> str:
+    return " ".join(str(query).split())
+
+
+def _short_url_namespace(query_key: str) -> str:
+    """按查询内容派生短链接命名空间。
+
+    分支序号在每次运行中都从 0 重新编号，缓存回放昨日条目时会与
+    当日新铸的短链接撞号；查询哈希则跨运行稳定且互不冲突。
+    """
+    return hashlib.blake2b(query_key.encode("utf-8"), digest_size=4).hexdigest()
+
+
+def _today_tag() -> str:
+    return f"{date.today():%Y%m%d}"
+
+
+def _load_web_cache() -> dict:
+    global _web_cache
+    if _web_cache is None:
+        _web_cache = {}
+        today = _today_tag()
+        dropped = 0
+        if _WEB_CACHE_PATH.exists():
+            for line in _WEB_CACHE_PATH.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    dropped += 1
+                    continue
+                # 非当日的条目视为过期；同一查询后写的行覆盖先写的行
+                if entry.get("date") != today:
+                    dropped += 1
+                    continue
+                if entry["query"] in _web_cache:
+                    dropped += 1
+                _web_cache[entry["query"]] = entry
+            # 加载时顺手压缩掉过期/被覆盖的行，避免 jsonl 只增不减
+            if dropped:
+                try:
+                    with _WEB_CACHE_PATH.open("w", encoding="utf-8") as fh:
+                        for entry in _web_cache.values():
+                            fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except OSError:
+                    pass
+    return _web_cache
+
+
+def _web_cache_put(query: str, text: str, sources: List[dict]) -> None:
+    entry = {
+        "query": _web_cache_key(query),
+        "date": _today_tag(),
+        "text": text,
+        "sources": sources,
+    }
+    _load_web_cache()[entry["query"]] = entry
+    try:
+        _WEB_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with _WEB_CACHE_PATH.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError:
+        # 缓存写盘失败不影响调研主流程
+        pass
 
 
 # LangGraph 节点定义
@@ -61,12 +183,7 @@ def generate_query(state: OverallState, config: RunnableConfig) -> QueryGenerati
         state["initial_search_query_count"] = configurable.number_of_initial_queries
 
     # 初始化通义千问模型
-    llm = ChatTongyi(
-        model=configurable.query_generator_model,
-        temperature=1.0,
-        max_retries=2,
-        api_key=os.getenv("DASHSCOPE_API_KEY"),
-    )
+    llm = _get_llm(configurable.query_generator_model, 1.0)
     structured_llm = llm.with_structured_output(SearchQueryList)
 
     # 格式化提示词
@@ -94,16 +211,17 @@ def continue_to_web_research(state: QueryGenerationState):
 
 def _format_tavily_sources(results: List[dict], run_id: str) -> tuple[str, List[dict]]:
     """将 Tavily 检索结果格式化为提示文本与引用信息。"""
-    urls = [item["url"] for item in results]
-    resolved_urls = resolve_urls(urls, run_id)
-
+    # 短链接映射在同一循环内生成，免去对 results 的额外一趟遍历
+    seen_urls: dict = {}
     formatted_blocks: List[str] = []
     sources: List[dict] = []
     for idx, item in enumerate(results, start=1):
         source_id = f"S{idx}"
         title = item.get("title") or item["url"]
         url = item["url"]
-        short_url = resolved_urls[url]
+        short_url = seen_urls.setdefault(
+            url, f"https://tav.link/{run_id}-{len(seen_urls)}"
+        )
         snippet = item.get("content") or ""
         published = item.get("published_date")
         block_lines = [
@@ -126,10 +244,11 @@ def _format_tavily_sources(results: List[dict], run_id: str) -> tuple[str, List[
     return "\n\n".join(formatted_blocks), sources
 
 
-def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
-    """使用 Tavily API 执行网络调研的 LangGraph 节点。
+async def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
+    """使用 Tavily API 执行网络调研的 LangGraph 异步节点。
 
-    结合 Tavily 检索结果与通义千问模型生成带引用的结构化综述。
+    结合 Tavily 检索结果与通义千问模型生成带引用的结构化综述；
+    多个 Send 分支在同一事件循环上并发执行。
 
     参数:
         state: 当前图状态，包含搜索查询与研究循环计数
@@ -139,30 +258,64 @@ def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
         状态更新字典，包含 sources_gathered、research_loop_count 与 web_research_result
     """
     configurable = Configuration.from_runnable_config(config)
+
+    query_key = _web_cache_key(state["search_query"])
+    cached = _load_web_cache().get(query_key)
+    if cached is not None:
+        return {
+            "sources_gathered": cached["sources"],
+            "search_query": [state["search_query"]],
+            "web_research_result": [cached["text"]],
+            "summaries_joined": cached["text"] + _SUMMARY_SEPARATOR,
+        }
+
     formatted_prompt = web_searcher_instructions.format(
         current_date=get_current_date(),
         research_topic=state["search_query"],
     )
 
-    search_response = tavily_client.search(
-        query=state["search_query"],
-        search_depth="advanced",
-        max_results=8,
-        include_answer=False,
-        include_raw_content=False,
-    )
+    semaphore = _research_semaphore()
+    async with semaphore:
+        search_response = await tavily_client.search(
+            query=state["search_query"],
+            search_depth="advanced",
+            max_results=8,
+            include_answer="advanced",
+            include_raw_content=False,
+        )
     results = search_response.get("results", [])
 
     if not results:
+        no_result_text = "未能从可靠来源检索到与该查询相关的公开信息。"
         return {
             "sources_gathered": [],
             "search_query": [state["search_query"]],
-            "web_research_result": [
-                "未能从可靠来源检索到与该查询相关的公开信息。"
-            ],
+            "web_research_result": [no_result_text],
+            "summaries_joined": no_result_text + _SUMMARY_SEPARATOR,
+        }
+
+    source_section, sources = _format_tavily_sources(
+        results, _short_url_namespace(query_key)
+    )
+
+    # Tavily 的预生成综述足够充分时直接采用，省去一次数千 token 的总结调用
+    answer = search_response.get("answer")
+    if answer and len(answer) >= _TAVILY_ANSWER_MIN_CHARS:
+        cited = sources[:3]
+        links = "、".join(f"[{s['title']}]({s['short_url']})" for s in cited)
+        modified_text = f"{answer}\n\n（来源：{links}）"
+        sources_gathered = [
+            {"label": s["title"], "short_url": s["short_url"], "value": s["url"]}
+            for s in cited
+        ]
+        _web_cache_put(state["search_query"], modified_text, sources_gathered)
+        return {
+            "sources_gathered": sources_gathered,
+            "search_query": [state["search_query"]],
+            "web_research_result": [modified_text],
+            "summaries_joined": modified_text + _SUMMARY_SEPARATOR,
         }
 
-    source_section, sources = _format_tavily_sources(results, str(state["id"]))
     prompt = (
         f"{formatted_prompt}\n\n"
         "以下是 Tavily 搜索得到的候选资料。撰写综述时请仅引用这些资料，"
@@ -172,28 +325,28 @@ def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
     )
 
     summarization_model = state.get("reasoning_model", configurable.answer_model)
-    llm = ChatTongyi(
-        model=summarization_model,
-        temperature=0.2,
-        max_retries=2,
-        api_key=os.getenv("DASHSCOPE_API_KEY"),
-    )
-    response = llm.invoke(prompt)
-    if isinstance(response, AIMessage):
-        raw_text = response.content
-    else:
-        raw_text = getattr(response, "content", str(response))
+    llm = _get_llm(summarization_model, 0.2)
+    # 流式消费生成结果，首 token 即开始累积，降低分支峰值内存与感知延迟
+    chunks: List[str] = []
+    async with semaphore:
+        async for chunk in llm.astream(prompt):
+            content = getattr(chunk, "content", "")
+            if isinstance(content, str) and content:
+                chunks.append(content)
+    raw_text = "".join(chunks)
 
     modified_text, sources_gathered = replace_citation_tokens(raw_text, sources)
+    _web_cache_put(state["search_query"], modified_text, sources_gathered)
 
     return {
         "sources_gathered": sources_gathered,
         "search_query": [state["search_query"]],
         "web_research_result": [modified_text],
+        "summaries_joined": modified_text + _SUMMARY_SEPARATOR,
     }
 
 
-def reflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
+async def reflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
     """识别知识空白并生成后续查询的 LangGraph 节点。
 
     分析当前摘要以定位需要继续调研的领域，并生成可能的后续查询；通过结构化输出来提取 JSON 格式结果。
@@ -215,16 +368,11 @@ def reflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
     formatted_prompt = reflection_instructions.format(
         current_date=current_date,
         research_topic=get_research_topic(state["messages"]),
-        summaries="\n\n---\n\n".join(state["web_research_result"]),
+        summaries=_joined_summaries(state),
     )
     # 初始化推理模型
-    llm = ChatTongyi(
-        model=reasoning_model,
-        temperature=1.0,
-        max_retries=2,
-        api_key=os.getenv("DASHSCOPE_API_KEY"),
-    )
-    result = llm.with_structured_output(Reflection).invoke(formatted_prompt)
+    llm = _get_llm(reasoning_model, 1.0)
+    result = await llm.with_structured_output(Reflection).ainvoke(formatted_prompt)
 
     return {
         "is_sufficient": result.is_sufficient,
@@ -290,16 +438,11 @@ def finalize_answer(state: OverallState, config: RunnableConfig):
     formatted_prompt = answer_instructions.format(
         current_date=current_date,
         research_topic=get_research_topic(state["messages"]),
-        summaries="\n---\n\n".join(state["web_research_result"]),
+        summaries=_joined_summaries(state),
     )
 
     # 初始化推理模型，默认为通义千问
-    llm = ChatTongyi(
-        model=reasoning_model,
-        temperature=0,
-        max_retries=2,
-        api_key=os.getenv("DASHSCOPE_API_KEY"),
-    )
+    llm = _get_llm(reasoning_model, 0.0)
     result = llm.invoke(formatted_prompt)
 
     # 将短链接替换为原始链接，并记录最终引用的来源
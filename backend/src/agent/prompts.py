@@ -1,9 +1,15 @@
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 
 
-# 以易读格式获取当前日期
+@lru_cache(maxsize=2)
+def _format_date(ordinal: int) -> str:
+    return date.fromordinal(ordinal).strftime("%B %d, %Y")
+
+
+# 以易读格式获取当前日期；按天记忆化，一次图调用内多节点重复取值零开销
 def get_current_date():
-    return datetime.now().strftime("%B %d, %Y")
+    return _format_date(date.today().toordinal())
 
 
 query_writer_instructions = """你的目标是生成高质量且多样化的网页搜索查询。这些查询会交给一款能够分析复杂结果、追踪链接并综合信息的高级自动化网络研究工具。
@@ -34,7 +40,9 @@ query_writer_instructions = """你的目标是生成高质量且多样化的网
 上下文: {research_topic}"""
 
 
-web_searcher_instructions = """围绕“{research_topic}”执行针对性的网络搜索，收集最新且可靠的信息，并将结果整合为可验证的文本产出。
+# 指令部分保持为不含动态字段的稳定前缀，研究主题集中放在末尾，
+# 便于推理服务按字节前缀命中 prompt cache
+web_searcher_instructions = """执行针对性的网络搜索，收集最新且可靠的信息，并将结果整合为可验证的文本产出。
 
 使用说明:
 - 所有搜索必须以获取最新信息为目标；当前日期为 {current_date}。
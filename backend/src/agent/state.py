@@ -14,6 +14,8 @@ class OverallState(TypedDict):
     messages: Annotated[list, add_messages]
     search_query: Annotated[list, operator.add]
     web_research_result: Annotated[list, operator.add]
+    # 增量维护的摘要拼接串（各段自带分隔符），省去每轮反思时的整体 join
+    summaries_joined: Annotated[str, operator.add]
     sources_gathered: Annotated[list, operator.add]
     initial_search_query_count: int
     max_research_loops: int
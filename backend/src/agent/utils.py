@@ -1,7 +1,11 @@
+import re
 from typing import Dict, List, Tuple
 
 from langchain_core.messages import AnyMessage, AIMessage, HumanMessage
 
+# 统一匹配 [S1]/[K2] 形式的引用占位符
+_CITATION_RE = re.compile(r"\[([SK]\d+)\]")
+
 
 def get_research_topic(messages: List[AnyMessage]) -> str:
     """从消息列表中提取研究主题。"""
@@ -48,19 +52,26 @@ def replace_citation_tokens(text: str, sources: List[Dict[str, str]]) -> Tuple[s
         tuple: (替换后的文本, 被引用的来源信息列表)。
     """
 
-    cited_sources: List[Dict[str, str]] = []
-    updated_text = text
-    for source in sources:
-        token = f"[{source['id']}]"
-        if token in updated_text:
-            short_url = source.get("short_url") or source.get("url", "")
-            markdown_link = f"[{source['title']}]({short_url})"
-            updated_text = updated_text.replace(token, markdown_link)
-            cited_sources.append(
-                {
-                    "label": source["title"],
-                    "short_url": short_url,
-                    "value": source["url"],
-                }
-            )
+    by_id = {source["id"]: source for source in sources}
+    cited_ids: set = set()
+
+    def _replace(match: "re.Match[str]") -> str:
+        source = by_id.get(match.group(1))
+        if source is None:
+            return match.group(0)
+        cited_ids.add(source["id"])
+        short_url = source.get("short_url") or source.get("url", "")
+        return f"[{source['title']}]({short_url})"
+
+    # 单次正则遍历同时完成“查找 + 替换 + 收集引用”，避免逐来源全文扫描
+    updated_text = _CITATION_RE.sub(_replace, text)
+    cited_sources: List[Dict[str, str]] = [
+        {
+            "label": source["title"],
+            "short_url": source.get("short_url") or source.get("url", ""),
+            "value": source["url"],
+        }
+        for source in sources
+        if source["id"] in cited_ids
+    ]
     return updated_text, cited_sources